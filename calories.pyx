@@ -0,0 +1,130 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# cython: cdivision=True
+# distutils: extra_compile_args = -O3 -ffast-math -fopenmp
+# distutils: extra_link_args = -fopenmp
+"""Формулы расхода калорий на Cython, те же, что в `kernels.py`.
+
+Константы формул берутся из `constants.py` при импорте модуля.
+
+Сборка: `cythonize -i calories.pyx`. Функции для массивов считают
+в несколько потоков (OpenMP); формулы для чисел вызываются из цикла
+напрямую как функции C.
+
+Сборка под процессор этой машины (не переносится на другие):
+`CFLAGS="-march=native" cythonize -i calories.pyx`.
+"""
+import numpy as np
+
+import constants
+
+from cython cimport floating
+from cython.parallel cimport prange
+
+cdef double MIN_IN_H = constants.MIN_IN_H
+cdef double RUN_SPEED_MULTIPLIER = constants.RUN_SPEED_MULTIPLIER
+cdef double RUN_SPEED_SHIFT = constants.RUN_SPEED_SHIFT
+cdef double WALK_WEIGHT_MULTIPLIER = constants.WALK_WEIGHT_MULTIPLIER
+cdef double SWIM_SPEED_SHIFT = constants.SWIM_SPEED_SHIFT
+cdef double SWIM_WEIGHT_MULTIPLIER = constants.SWIM_WEIGHT_MULTIPLIER
+cdef double K_MIN_PER_KM = constants.K_MIN_PER_KM
+cdef double K_WALK_SPEED = constants.K_WALK_SPEED
+
+
+cpdef double run_cals(double speed,
+                      double weight,
+                      double duration) noexcept nogil:
+    """Калории при беге, см. `Running`."""
+    return (
+        (RUN_SPEED_MULTIPLIER * speed + RUN_SPEED_SHIFT)
+        * weight * duration * K_MIN_PER_KM
+    )
+
+
+cdef inline double _walk_cals(double speed,
+                             double weight,
+                             double duration,
+                             double height) noexcept nogil:
+    return (
+        (WALK_WEIGHT_MULTIPLIER + K_WALK_SPEED * speed * speed / height)
+        * weight * duration * MIN_IN_H
+    )
+
+
+def walk_cals(double speed, double weight, double duration, double height):
+    """Калории при спортивной ходьбе, см. `SportsWalking`.
+
+    С `cdivision` деление на нулевой рост дало бы `inf`, а `kernels.py`
+    в этом случае бросает `ZeroDivisionError`: проверяем явно.
+    """
+    if height == 0:
+        raise ZeroDivisionError('division by zero')
+    return _walk_cals(speed, weight, duration, height)
+
+
+cpdef double swim_cals(double speed,
+                       double weight,
+                       double duration) noexcept nogil:
+    """Калории при плавании, см. `Swimming`."""
+    return (
+        (speed + SWIM_SPEED_SHIFT)
+        * weight * duration * SWIM_WEIGHT_MULTIPLIER
+    )
+
+
+cdef _check_sizes(Py_ssize_t size, sizes):
+    """Проверить, что все массивы полей одной длины.
+
+    Циклы ниже идут без проверки границ: массив короче `speed`
+    читался бы за своим концом.
+    """
+    for other in sizes:
+        if other != size:
+            raise ValueError('Массивы полей должны быть одной длины.')
+
+
+def run_cals_array(const floating[::1] speed,
+                   const floating[::1] weight,
+                   const floating[::1] duration):
+    """Калории при беге для массивов."""
+    cdef Py_ssize_t i
+    _check_sizes(speed.shape[0], (weight.shape[0], duration.shape[0]))
+    calories = np.empty(speed.shape[0])
+    cdef double[::1] out = calories
+    for i in prange(speed.shape[0], nogil=True):
+        out[i] = run_cals(speed[i], weight[i], duration[i])
+    return calories
+
+
+def walk_cals_array(const floating[::1] speed,
+                    const floating[::1] weight,
+                    const floating[::1] duration,
+                    const floating[::1] height):
+    """Калории при спортивной ходьбе для массивов."""
+    cdef Py_ssize_t i
+    _check_sizes(speed.shape[0],
+                 (weight.shape[0], duration.shape[0], height.shape[0]))
+    calories = np.empty(speed.shape[0])
+    cdef double[::1] out = calories
+    for i in prange(speed.shape[0], nogil=True):
+        out[i] = _walk_cals(speed[i], weight[i], duration[i], height[i])
+    return calories
+
+
+def swim_cals_array(const floating[::1] speed,
+                    const floating[::1] weight,
+                    const floating[::1] duration):
+    """Калории при плавании для массивов."""
+    cdef Py_ssize_t i
+    _check_sizes(speed.shape[0], (weight.shape[0], duration.shape[0]))
+    calories = np.empty(speed.shape[0])
+    cdef double[::1] out = calories
+    for i in prange(speed.shape[0], nogil=True):
+        out[i] = swim_cals(speed[i], weight[i], duration[i])
+    return calories
+
+
+# Функции для массивов принимают и `float64`, и `float32`; результат,
+# как и в AOT-сборке `kernels.py`, всегда `float64`.
+run_cals_array32 = run_cals_array
+walk_cals_array32 = walk_cals_array
+swim_cals_array32 = swim_cals_array
@@ -0,0 +1,21 @@
+"""Константы формул расхода калорий.
+
+Классы тренировок в `homework.py`, формулы в `kernels.py` и модуль
+Cython `calories.pyx` берут значения отсюда. Модуль ничего не
+импортирует, поэтому его загрузка не тянет за собой numba.
+"""
+M_IN_KM = 1000
+MIN_IN_H = 60
+RUN_SPEED_MULTIPLIER = 18
+RUN_SPEED_SHIFT = 1.79
+WALK_WEIGHT_MULTIPLIER = 0.035
+WALK_SPEED_HEIGHT_MULTIPLIER = 0.029
+KMH_IN_MSEC = round(1000 / 3600, 3)
+CM_IN_M = 100
+SWIM_SPEED_SHIFT = 1.1
+SWIM_WEIGHT_MULTIPLIER = 2
+
+# Произведения констант посчитаны заранее, чтобы в формулах было
+# меньше операций.
+K_MIN_PER_KM = MIN_IN_H / M_IN_KM
+K_WALK_SPEED = KMH_IN_MSEC ** 2 * CM_IN_M * WALK_SPEED_HEIGHT_MULTIPLIER
@@ -1,15 +1,42 @@
-from dataclasses import dataclass, asdict
+import sys
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import repeat
 
+import numpy as np
 
-@dataclass
+import constants
+
+# Формулы расхода калорий: сборка Cython (`calories.pyx`), сборка
+# numba AOT (`python kernels.py`) или `kernels.py` как есть.
+try:
+    from calories import (run_cals, run_cals_array, run_cals_array32,
+                          swim_cals, swim_cals_array, swim_cals_array32,
+                          walk_cals, walk_cals_array, walk_cals_array32)
+except ImportError:
+    try:
+        from calorie_kernels import (run_cals, run_cals_array,
+                                     run_cals_array32, swim_cals,
+                                     swim_cals_array, swim_cals_array32,
+                                     walk_cals, walk_cals_array,
+                                     walk_cals_array32)
+    except ImportError:
+        from kernels import (run_cals, run_cals_array, run_cals_array32,
+                             swim_cals, swim_cals_array, swim_cals_array32,
+                             walk_cals, walk_cals_array, walk_cals_array32)
+
+
+_FMT = ('Тип тренировки: %s; '
+        'Длительность: %.3f ч.; '
+        'Дистанция: %.3f км; '
+        'Ср. скорость: %.3f км/ч; '
+        'Потрачено ккал: %.3f.')
+
+
+@dataclass(slots=True)
 class InfoMessage:
     """Информационное сообщение о тренировке."""
-    INFO_STRING = ('Тип тренировки: {training_type}; '
-                   'Длительность: {duration:.3f} ч.; '
-                   'Дистанция: {distance:.3f} км; '
-                   'Ср. скорость: {speed:.3f} км/ч; '
-                   'Потрачено ккал: {calories:.3f}.')
-
     training_type: str
     duration: float
     distance: float
@@ -18,15 +45,51 @@ class InfoMessage:
 
     def get_message(self) -> str:
         """Вывод информационного сообщения"""
-        return self.INFO_STRING.format(**asdict(self))
+        return _FMT % (self.training_type,
+                       self.duration,
+                       self.distance,
+                       self.speed,
+                       self.calories)
+
+
+def format_messages(types: Iterable[str],
+                    durations: Iterable[float],
+                    distances: Iterable[float],
+                    speeds: Iterable[float],
+                    calories: Iterable[float]) -> list[str]:
+    """Собрать сообщения по готовым массивам показателей тренировок."""
+    return [
+        _FMT % values
+        for values in zip(types, durations, distances, speeds, calories)
+    ]
+
+
+def _distance(action: float, len_step: float) -> float:
+    """Дистанция в км по числу шагов или гребков."""
+    return (action * len_step) / constants.M_IN_KM
+
+
+def _pool_speed(length_pool: float,
+                count_pool: float,
+                duration: float) -> float:
+    """Средняя скорость плавания по длине и числу бассейнов."""
+    return length_pool * count_pool / constants.M_IN_KM / duration
 
 
 class Training:
     """Базовый класс тренировки."""
-    M_IN_KM = 1000
+    # `__dict__` создаётся только при записи атрибута вне слотов
+    # (например, при подмене метода у экземпляра в тестах).
+    __slots__ = ('action', 'duration_h', 'weight_kg',
+                 '_distance', '_speed', '__dict__')
+
+    # Название класса для сообщений; у подклассов задаётся
+    # в `__init_subclass__`.
+    _NAME = 'Training'
+    M_IN_KM = constants.M_IN_KM
     SEC_IN_HOUR = 3600
     LEN_STEP = 0.65
-    MIN_IN_H = 60
+    MIN_IN_H = constants.MIN_IN_H
 
     def __init__(self,
                  action: int,
@@ -36,14 +99,26 @@ class Training:
         self.action = action
         self.duration_h = duration
         self.weight_kg = weight
+        # Данные тренировки не меняются, поэтому дистанция и скорость
+        # считаются при первом запросе и дальше берутся из слотов.
+        self._distance = None
+        self._speed = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._NAME = cls.__name__
 
     def get_distance(self) -> float:
         """Получить дистанцию в км."""
-        return (self.action * self.LEN_STEP) / self.M_IN_KM
+        if self._distance is None:
+            self._distance = _distance(self.action, self.LEN_STEP)
+        return self._distance
 
     def get_mean_speed(self) -> float:
         """Получить среднюю скорость движения."""
-        return self.get_distance() / self.duration_h
+        if self._speed is None:
+            self._speed = self.get_distance() / self.duration_h
+        return self._speed
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
@@ -52,7 +127,7 @@ class Training:
 
     def show_training_info(self) -> InfoMessage:
         """Вернуть информационное сообщение о выполненной тренировке."""
-        return InfoMessage(type(self).__name__,
+        return InfoMessage(self._NAME,
                            self.duration_h,
                            self.get_distance(),
                            self.get_mean_speed(),
@@ -61,26 +136,26 @@ class Training:
 
 class Running(Training):
     """Тренировка: бег."""
-    CALORIES_MEAN_SPEED_MULTIPLIER = 18
-    CALORIES_MEAN_SPEED_SHIFT = 1.79
+    __slots__ = ()
+
+    CALORIES_MEAN_SPEED_MULTIPLIER = constants.RUN_SPEED_MULTIPLIER
+    CALORIES_MEAN_SPEED_SHIFT = constants.RUN_SPEED_SHIFT
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
-        return (
-            (
-                self.CALORIES_MEAN_SPEED_MULTIPLIER * self.get_mean_speed()
-                + self.CALORIES_MEAN_SPEED_SHIFT
-            ) * self.weight_kg / self.M_IN_KM
-            * self.duration_h * self.MIN_IN_H
-        )
+        return run_cals(self.get_mean_speed(),
+                        self.weight_kg,
+                        self.duration_h)
 
 
 class SportsWalking(Training):
     """Тренировка: спортивная ходьба."""
-    FIRST_CALORIES_WEIGHT_MULTIPLIER = 0.035
-    SECOND_CALORIES_WEIGHT_MULTIPLIER = 0.029
-    KM_H_TO_M_S = round(1000 / 3600, 3)
-    CM_TO_M = 100
+    __slots__ = ('height_cm',)
+
+    FIRST_CALORIES_WEIGHT_MULTIPLIER = constants.WALK_WEIGHT_MULTIPLIER
+    SECOND_CALORIES_WEIGHT_MULTIPLIER = constants.WALK_SPEED_HEIGHT_MULTIPLIER
+    KM_H_TO_M_S = constants.KMH_IN_MSEC
+    CM_TO_M = constants.CM_IN_M
 
     def __init__(self,
                  action: int,
@@ -93,26 +168,19 @@ class SportsWalking(Training):
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
-        return (
-            (
-                self.FIRST_CALORIES_WEIGHT_MULTIPLIER * self.weight_kg
-                + (
-                    (self.get_mean_speed() * self.KM_H_TO_M_S) ** 2
-                    / (
-                        self.height_cm / self.CM_TO_M
-                    )
-                )
-                * self.SECOND_CALORIES_WEIGHT_MULTIPLIER * self.weight_kg
-            )
-            * self.duration_h * self.MIN_IN_H
-        )
+        return walk_cals(self.get_mean_speed(),
+                         self.weight_kg,
+                         self.duration_h,
+                         self.height_cm)
 
 
 class Swimming(Training):
     """Тренировка: плавание."""
+    __slots__ = ('length_pool_m', 'count_pool')
+
     LEN_STEP = 1.38
-    CALORIES_SPEED_SHIFT = 1.1
-    WEIGHT_DURATION_MULTIPLIER = 2
+    CALORIES_SPEED_SHIFT = constants.SWIM_SPEED_SHIFT
+    WEIGHT_DURATION_MULTIPLIER = constants.SWIM_WEIGHT_MULTIPLIER
 
     def __init__(self,
                  action: int,
@@ -127,36 +195,324 @@ class Swimming(Training):
 
     def get_mean_speed(self):
         """Получить среднюю скорость движения."""
-        return (self.length_pool_m * self.count_pool
-                / self.M_IN_KM / self.duration_h)
+        if self._speed is None:
+            self._speed = _pool_speed(self.length_pool_m,
+                                      self.count_pool,
+                                      self.duration_h)
+        return self._speed
 
     def get_spent_calories(self):
         """Получить количество затраченных калорий."""
-        return (
-            (
-                self.get_mean_speed() + self.CALORIES_SPEED_SHIFT
-            )
-            * self.WEIGHT_DURATION_MULTIPLIER
-            * self.weight_kg * self.duration_h
-        )
+        return swim_cals(self.get_mean_speed(),
+                         self.weight_kg,
+                         self.duration_h)
+
+
+_WORKOUTS: dict[str, type[Training]] = {
+    'SWM': Swimming,
+    'RUN': Running,
+    'WLK': SportsWalking
+}
 
 
 def read_package(workout_type: str, data: list[int]) -> Training:
     """Прочитать данные полученные от датчиков."""
-    workouts: dict[str, type[Training]] = {
-        'SWM': Swimming,
-        'RUN': Running,
-        'WLK': SportsWalking
+    workout = _WORKOUTS.get(workout_type)
+    if workout is None:
+        raise ValueError('Нет данных о данном типе тренировок!')
+    return workout(*data)
+
+
+def _steps_metrics(len_step: float,
+                   kernel: Callable[..., float],
+                   action: float,
+                   duration: float,
+                   weight: float,
+                   *extra: float) -> tuple[float, float, float, float]:
+    """Длительность, дистанция, скорость и калории по шагам."""
+    distance = _distance(action, len_step)
+    speed = distance / duration
+    return duration, distance, speed, kernel(speed, weight, duration, *extra)
+
+
+def _pool_metrics(len_step: float,
+                  kernel: Callable[..., float],
+                  action: float,
+                  duration: float,
+                  weight: float,
+                  length_pool: float,
+                  count_pool: float) -> tuple[float, float, float, float]:
+    """Длительность, дистанция, скорость и калории плавания."""
+    speed = _pool_speed(length_pool, count_pool, duration)
+    return (duration,
+            _distance(action, len_step),
+            speed,
+            kernel(speed, weight, duration))
+
+
+def _metrics_table(
+        run: Callable, walk: Callable, swim: Callable
+) -> dict[str, Callable[..., tuple]]:
+    """Расчёт показателей по коду тренировки с заданными формулами."""
+    return {
+        'SWM': partial(_pool_metrics, Swimming.LEN_STEP, swim),
+        'RUN': partial(_steps_metrics, Running.LEN_STEP, run),
+        'WLK': partial(_steps_metrics, SportsWalking.LEN_STEP, walk),
     }
-    if workout_type not in workouts:
+
+
+def _get_metrics(metrics: dict[str, Callable[..., tuple]],
+                 workout_type: str) -> Callable[..., tuple]:
+    """Выбрать расчёт показателей по коду тренировки."""
+    workout_metrics = metrics.get(workout_type)
+    if workout_metrics is None:
         raise ValueError('Нет данных о данном типе тренировок!')
-    return workouts[workout_type](*data)
+    return workout_metrics
+
+
+# Расчёт показателей без создания объектов тренировок: функция
+# выбирается одним поиском в словаре по коду тренировки. Те же
+# функции работают и с массивами полей, если им передать формулы для
+# массивов нужной точности: скомпилированные заранее формулы
+# принимают только свой тип.
+_METRICS = _metrics_table(run_cals, walk_cals, swim_cals)
+_ARRAY_METRICS: dict[np.dtype, dict[str, Callable[..., tuple]]] = {
+    np.dtype(np.float64): _metrics_table(run_cals_array,
+                                         walk_cals_array,
+                                         swim_cals_array),
+    np.dtype(np.float32): _metrics_table(run_cals_array32,
+                                         walk_cals_array32,
+                                         swim_cals_array32),
+}
+_NAMES: dict[str, str] = {
+    workout_type: workout._NAME
+    for workout_type, workout in _WORKOUTS.items()
+}
+
+
+def get_package_message(workout_type: str, data: list[int]) -> str:
+    """Вернуть сообщение о тренировке прямо по данным датчиков."""
+    metrics = _get_metrics(_METRICS, workout_type)
+    duration, distance, speed, calories = metrics(*data)
+    return _FMT % (_NAMES[workout_type], duration, distance, speed, calories)
+
+
+@lru_cache(maxsize=1024)
+def compute_message(workout_type: str, data: tuple) -> str:
+    """Вернуть сообщение о тренировке, запоминая результат.
+
+    Выгодно, только если одинаковые пакеты повторяются (повторная
+    отправка, демо, тесты): иначе кэш лишь занимает память. Данные
+    передаются кортежем, чтобы их можно было хешировать:
+    `compute_message(workout_type, tuple(data))`.
+    """
+    return get_package_message(workout_type, data)
+
+
+# Размер порции: массивы одной порции вместе помещаются в кэш L2.
+CALORIES_BATCH_SIZE = 4096
+
+
+def _calories_in_batches(workout_type: str,
+                         fields: tuple,
+                         batch_size: int,
+                         dtype: type[np.floating]) -> np.ndarray:
+    """Посчитать калории по массивам полей, порциями по `batch_size`.
+
+    Вычисления идут в точности `dtype`: `float32` вдвое сокращает
+    объём данных, а трёх знаков после запятой в калориях хватает.
+    Поддерживаются только `float32` и `float64`.
+    """
+    dtype_metrics = _ARRAY_METRICS.get(np.dtype(dtype))
+    if dtype_metrics is None:
+        raise ValueError(
+            f'Точность {np.dtype(dtype)} не поддерживается: '
+            'используйте float32 или float64.'
+        )
+    fields = [
+        np.ascontiguousarray(field)
+        for field in np.broadcast_arrays(
+            *(np.asarray(field, dtype=dtype) for field in fields)
+        )
+    ]
+    metrics = dtype_metrics[workout_type]
+    calories = np.empty_like(fields[0])
+    for start in range(0, calories.size, batch_size):
+        chunk = slice(start, start + batch_size)
+        *_, calories[chunk] = metrics(*(field[chunk] for field in fields))
+    return calories
+
+
+def running_calories(action, duration, weight,
+                     batch_size: int = CALORIES_BATCH_SIZE,
+                     dtype: type[np.floating] = np.float32) -> np.ndarray:
+    """Калории для массивов тренировок `Running`."""
+    return _calories_in_batches('RUN',
+                                (action, duration, weight),
+                                batch_size,
+                                dtype)
+
+
+def walking_calories(action, duration, weight, height,
+                     batch_size: int = CALORIES_BATCH_SIZE,
+                     dtype: type[np.floating] = np.float32) -> np.ndarray:
+    """Калории для массивов тренировок `SportsWalking`."""
+    return _calories_in_batches('WLK',
+                                (action, duration, weight, height),
+                                batch_size,
+                                dtype)
+
+
+def swimming_calories(action, duration, weight, length_pool, count_pool,
+                      batch_size: int = CALORIES_BATCH_SIZE,
+                      dtype: type[np.floating] = np.float32) -> np.ndarray:
+    """Калории для массивов тренировок `Swimming`."""
+    return _calories_in_batches(
+        'SWM',
+        (action, duration, weight, length_pool, count_pool),
+        batch_size,
+        dtype
+    )
+
+
+@dataclass
+class TrainingBatch:
+    """Набор тренировок: по одному массиву на каждое поле датчиков.
+
+    Тип тренировки хранится числом в `kind`, поля, которых у тренировки
+    нет (например, рост у бега), заполнены `nan`.
+    """
+    RUN = 0
+    WLK = 1
+    SWM = 2
+    KINDS = {'RUN': RUN, 'WLK': WLK, 'SWM': SWM}
+    # Строки массива полей, куда попадают данные пакета каждого типа.
+    FIELDS_COUNT = 6
+    FIELD_ROWS = {RUN: [0, 1, 2], WLK: [0, 1, 2, 3], SWM: [0, 1, 2, 4, 5]}
+
+    action: np.ndarray
+    duration: np.ndarray
+    weight: np.ndarray
+    height: np.ndarray
+    length_pool: np.ndarray
+    count_pool: np.ndarray
+    kind: np.ndarray
+
+    @classmethod
+    def from_packages(
+            cls,
+            packages: list[tuple[str, list[int]]],
+            dtype: type[np.floating] = np.float32
+    ) -> 'TrainingBatch':
+        """Собрать набор тренировок из пакетов датчиков."""
+        fields = np.full((cls.FIELDS_COUNT, len(packages)), np.nan,
+                         dtype=dtype)
+        kind = np.empty(len(packages), dtype=np.int8)
+        for position, (workout_type, data) in enumerate(packages):
+            code = cls.KINDS.get(workout_type)
+            if code is None:
+                raise ValueError('Нет данных о данном типе тренировок!')
+            kind[position] = code
+            fields[cls.FIELD_ROWS[code], position] = data
+        return cls(*fields, kind)
+
+    def compute_all(self) -> np.ndarray:
+        """Получить количество затраченных калорий для всех тренировок.
+
+        Калории считаются в точности полей, если это `float32` или
+        `float64`, иначе (например, для целых чисел) в `float64`.
+        """
+        if not np.isin(self.kind, list(self.KINDS.values())).all():
+            raise ValueError('Нет данных о данном типе тренировок!')
+        dtype = self.action.dtype
+        if dtype not in _ARRAY_METRICS:
+            dtype = np.dtype(np.float64)
+        calories = np.empty(self.kind.shape, dtype=dtype)
+        run = self.kind == self.RUN
+        calories[run] = running_calories(self.action[run],
+                                         self.duration[run],
+                                         self.weight[run],
+                                         dtype=dtype)
+        walk = self.kind == self.WLK
+        calories[walk] = walking_calories(self.action[walk],
+                                          self.duration[walk],
+                                          self.weight[walk],
+                                          self.height[walk],
+                                          dtype=dtype)
+        swim = self.kind == self.SWM
+        calories[swim] = swimming_calories(self.action[swim],
+                                           self.duration[swim],
+                                           self.weight[swim],
+                                           self.length_pool[swim],
+                                           self.count_pool[swim],
+                                           dtype=dtype)
+        return calories
+
+
+def read_packages_batch(
+        packages: list[tuple[str, list[int]]]
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Сгруппировать пакеты по типу тренировки.
+
+    Для каждого типа возвращает номера пакетов во входном списке и
+    массив данных формы (число полей, число пакетов): каждое поле
+    датчика хранится отдельной непрерывной строкой.
+    """
+    positions: dict[str, list[int]] = {}
+    rows: dict[str, list[list[int]]] = {}
+    for position, (workout_type, data) in enumerate(packages):
+        positions.setdefault(workout_type, []).append(position)
+        rows.setdefault(workout_type, []).append(data)
+    return {
+        workout_type: (
+            np.array(positions[workout_type]),
+            np.ascontiguousarray(
+                np.array(rows[workout_type], dtype=np.float64).T
+            )
+        )
+        for workout_type in rows
+    }
+
+
+def get_packages_info(packages: list[tuple[str, list[int]]]) -> list[str]:
+    """Вернуть сообщения о тренировках для списка пакетов.
+
+    Тренировки одного типа считаются вместе над массивами `numpy`,
+    порядок сообщений совпадает с порядком пакетов.
+    """
+    messages: list[str] = [''] * len(packages)
+    for workout_type, (positions, fields) in read_packages_batch(
+            packages).items():
+        metrics = _get_metrics(_ARRAY_METRICS[fields.dtype], workout_type)
+        for position, message in zip(positions, format_messages(
+                repeat(_NAMES[workout_type]), *metrics(*fields))):
+            messages[position] = message
+    return messages
+
+
+def format_training(training: Training) -> str:
+    """Вернуть сообщение о тренировке, не создавая `InfoMessage`."""
+    return _FMT % (training._NAME,
+                   training.duration_h,
+                   training.get_distance(),
+                   training.get_mean_speed(),
+                   training.get_spent_calories())
 
 
 def main(training: Training) -> None:
     """Главная функция."""
-    info: InfoMessage = training.show_training_info()
-    print(info.get_message())
+    print(format_training(training))
+
+
+def _write_messages(messages: list[str]) -> None:
+    """Вывести сообщения в консоль одной записью."""
+    if messages:
+        sys.stdout.write('\n'.join(messages) + '\n')
+
+
+def main_batch(trainings: Iterable[Training]) -> None:
+    """Вывести сообщения о нескольких тренировках сразу."""
+    _write_messages([format_training(training) for training in trainings])
 
 
 if __name__ == '__main__':
@@ -166,6 +522,4 @@ if __name__ == '__main__':
         ('WLK', [9000, 1, 75, 180]),
     ]
 
-    for workout_type, data in packages:
-        training: Training = read_package(workout_type, data)
-        main(training)
+    _write_messages(get_packages_info(packages))
@@ -0,0 +1,85 @@
+"""Формулы расхода калорий для тренировок из `homework.py`.
+
+Если установлена numba, формулы компилируются при первом вызове. Модуль
+можно и заранее скомпилировать numba (AOT) командой `python kernels.py`:
+рядом появится расширение `calorie_kernels` с теми же функциями, и
+`homework.py` будет загружать его без JIT-компиляции при запуске. Без
+numba формулы работают как обычные функции Python.
+"""
+from constants import (K_MIN_PER_KM, K_WALK_SPEED, MIN_IN_H,
+                       RUN_SPEED_MULTIPLIER, RUN_SPEED_SHIFT,
+                       SWIM_SPEED_SHIFT, SWIM_WEIGHT_MULTIPLIER,
+                       WALK_WEIGHT_MULTIPLIER)
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Заглушка `numba.njit`: формулы остаются функциями Python."""
+        def decorator(func):
+            return func
+        return decorator
+
+
+def _running(speed, weight, duration):
+    """Калории при беге, см. `Running`."""
+    return (
+        (RUN_SPEED_MULTIPLIER * speed + RUN_SPEED_SHIFT)
+        * weight * duration * K_MIN_PER_KM
+    )
+
+
+def _walking(speed, weight, duration, height):
+    """Калории при спортивной ходьбе, см. `SportsWalking`."""
+    return (
+        (WALK_WEIGHT_MULTIPLIER + K_WALK_SPEED * speed * speed / height)
+        * weight * duration * MIN_IN_H
+    )
+
+
+def _swimming(speed, weight, duration):
+    """Калории при плавании, см. `Swimming`."""
+    return (
+        (speed + SWIM_SPEED_SHIFT)
+        * weight * duration * SWIM_WEIGHT_MULTIPLIER
+    )
+
+
+run_cals = njit(cache=True, fastmath=True)(_running)
+walk_cals = njit(cache=True, fastmath=True)(_walking)
+swim_cals = njit(cache=True, fastmath=True)(_swimming)
+
+run_cals_array = njit(cache=True, fastmath=True, parallel=True)(_running)
+walk_cals_array = njit(cache=True, fastmath=True, parallel=True)(_walking)
+swim_cals_array = njit(cache=True, fastmath=True, parallel=True)(_swimming)
+
+# При JIT-компиляции тип задают массивы при вызове. В AOT-сборке
+# формулы для `float32` принимают массивы `float32`, а считают и
+# возвращают `float64`: константы формул numba типизирует как `float64`.
+run_cals_array32 = run_cals_array
+walk_cals_array32 = walk_cals_array
+swim_cals_array32 = swim_cals_array
+
+# Функции AOT-сборки `calorie_kernels`: имя, формула и сигнатура.
+_EXPORTS = (
+    ('run_cals', _running, 'f8(f8, f8, f8)'),
+    ('run_cals_array', _running, 'f8[:](f8[:], f8[:], f8[:])'),
+    ('run_cals_array32', _running, 'f8[:](f4[:], f4[:], f4[:])'),
+    ('walk_cals', _walking, 'f8(f8, f8, f8, f8)'),
+    ('walk_cals_array', _walking, 'f8[:](f8[:], f8[:], f8[:], f8[:])'),
+    ('walk_cals_array32', _walking, 'f8[:](f4[:], f4[:], f4[:], f4[:])'),
+    ('swim_cals', _swimming, 'f8(f8, f8, f8)'),
+    ('swim_cals_array', _swimming, 'f8[:](f8[:], f8[:], f8[:])'),
+    ('swim_cals_array32', _swimming, 'f8[:](f4[:], f4[:], f4[:])'),
+)
+
+
+if __name__ == '__main__':
+    try:
+        from numba.pycc import CC
+    except ImportError:
+        raise SystemExit('Для сборки `calorie_kernels` нужна numba.')
+    cc = CC('calorie_kernels')
+    for name, func, signature in _EXPORTS:
+        cc.export(name, signature)(func)
+    cc.compile()
@@ -3,6 +3,8 @@ import pytest
 import types
 import inspect
 from collections import namedtuple
+import numpy as np
+import kernels
 from conftest import Capturing
 
 try:
@@ -451,3 +453,301 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+def test_get_packages_info():
+    packages = [
+        ('WLK', [9000, 1, 75, 180]),
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [1206, 12, 6]),
+        ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+    ]
+    expected = []
+    for workout_type, data in packages:
+        with Capturing() as output:
+            homework.main(homework.read_package(workout_type, data))
+        expected.extend(output)
+    assert homework.get_packages_info(packages) == expected, (
+        'Функция `get_packages_info` должна возвращать те же сообщения, '
+        'что и `main`, в порядке пакетов.'
+    )
+
+
+@pytest.mark.parametrize('function_name, workout_type, data', [
+    ('running_calories', 'RUN',
+        [[9000, 420, 1206], [1, 4, 12], [75, 20, 6]]),
+    ('walking_calories', 'WLK',
+        [[9000, 420, 1206], [1, 4, 12], [75, 20, 6], [180, 42, 12]]),
+    ('swimming_calories', 'SWM',
+        [[720, 420, 1206], [1, 4, 12], [80, 20, 6], [25, 42, 12],
+         [40, 4, 6]]),
+])
+@pytest.mark.parametrize('batch_size', [1, 2, 4096])
+def test_calories_batch(function_name, workout_type, data, batch_size):
+    assert hasattr(homework, function_name), (
+        f'Создайте функцию `{function_name}`.'
+    )
+    result = getattr(homework, function_name)(*data, batch_size=batch_size)
+    expected = [
+        homework.read_package(workout_type, list(row)).get_spent_calories()
+        for row in zip(*data)
+    ]
+    assert result == pytest.approx(expected), (
+        f'Функция `{function_name}` должна считать калории так же, '
+        'как метод `get_spent_calories`.'
+    )
+
+
+def test_calories_batch_dtype():
+    data = [[9000, 420, 1206], [1, 4, 12], [75, 20, 6]]
+    result = homework.running_calories(*data)
+    assert result.dtype == np.float32, (
+        'По умолчанию функция `running_calories` должна считать '
+        'в точности `float32`.'
+    )
+    result_64 = homework.running_calories(*data, dtype=np.float64)
+    assert result_64.dtype == np.float64, (
+        'С `dtype=np.float64` функция `running_calories` должна '
+        'возвращать `float64`.'
+    )
+    assert result == pytest.approx(result_64), (
+        'Калории в точности `float32` и `float64` должны совпадать.'
+    )
+    with pytest.raises(ValueError):
+        homework.running_calories(*data, dtype=np.float16)
+
+
+def test_main_batch():
+    assert hasattr(homework, 'main_batch'), (
+        'Создайте функцию `main_batch`.'
+    )
+    packages = [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [1206, 12, 6]),
+        ('WLK', [9000, 1.5, 75, 180]),
+    ]
+    trainings = [homework.read_package(*package) for package in packages]
+    with Capturing() as expected:
+        for training in trainings:
+            homework.main(training)
+    with Capturing() as output:
+        homework.main_batch(trainings)
+    assert output == expected, (
+        'Функция `main_batch` должна печатать те же сообщения, что и `main`.'
+    )
+
+
+def test_TrainingBatch_compute_all():
+    assert inspect.isclass(homework.TrainingBatch), (
+        '`TrainingBatch` должен быть классом.'
+    )
+    packages = [
+        ('WLK', [9000, 1, 75, 180]),
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [1206, 12, 6]),
+        ('RUN', [9000, 1, 75]),
+        ('SWM', [420, 4, 20, 42, 4]),
+    ]
+    batch = homework.TrainingBatch.from_packages(packages)
+    expected = [
+        homework.read_package(*package).get_spent_calories()
+        for package in packages
+    ]
+    assert batch.compute_all() == pytest.approx(expected), (
+        'Метод `compute_all` класса `TrainingBatch` должен считать калории '
+        'так же, как метод `get_spent_calories` тренировок.'
+    )
+
+
+def test_TrainingBatch_integer_fields():
+    fields = [np.array([value]) for value in (9000, 1, 75, 0, 0, 0)]
+    batch = homework.TrainingBatch(
+        *fields, np.array([homework.TrainingBatch.RUN], dtype=np.int8)
+    )
+    result = batch.compute_all()
+    assert result.dtype == np.float64, (
+        'Для целочисленных полей метод `compute_all` должен считать '
+        'калории в `float64`.'
+    )
+    assert result == pytest.approx([481.905]), (
+        'Метод `compute_all` не должен округлять калории до целых.'
+    )
+
+
+def test_TrainingBatch_unknown_kind():
+    fields = [np.array([value, value]) for value in (9000, 1, 75, 0, 0, 0)]
+    batch = homework.TrainingBatch(*fields, np.array([0, 7], dtype=np.int8))
+    with pytest.raises(ValueError):
+        batch.compute_all()
+
+
+@pytest.mark.parametrize('input_data', [
+    ['SWM', [720, 1, 80, 25, 40]],
+    ['RUN', [1206, 12, 6]],
+    ['WLK', [9000, 1.5, 75, 180]],
+    ['WLK', [3000.33, 2.512, 75.8, 180.1]],
+])
+def test_get_package_message(input_data):
+    assert hasattr(homework, 'get_package_message'), (
+        'Создайте функцию `get_package_message`.'
+    )
+    with Capturing() as expected:
+        homework.main(homework.read_package(*input_data))
+    assert [homework.get_package_message(*input_data)] == expected, (
+        'Функция `get_package_message` должна возвращать то же сообщение, '
+        'что печатает `main`.'
+    )
+
+
+def test_compute_message():
+    assert hasattr(homework, 'compute_message'), (
+        'Создайте функцию `compute_message`.'
+    )
+    homework.compute_message.cache_clear()
+    data = [9000, 1, 75, 180]
+    expected = homework.get_package_message('WLK', data)
+    assert homework.compute_message('WLK', tuple(data)) == expected
+    assert homework.compute_message('WLK', tuple(data)) == expected
+    assert homework.compute_message.cache_info().hits == 1, (
+        'Функция `compute_message` должна запоминать результат.'
+    )
+
+
+@pytest.mark.parametrize('input_data', [
+    ['SWM', [720, 1, 80, 25, 40]],
+    ['RUN', [1206, 12, 6]],
+    ['WLK', [3000.33, 2.512, 75.8, 180.1]],
+])
+def test_format_training(input_data):
+    training = homework.read_package(*input_data)
+    assert (homework.format_training(training)
+            == training.show_training_info().get_message()), (
+        'Функция `format_training` должна возвращать то же сообщение, '
+        'что и `InfoMessage.get_message`.'
+    )
+
+
+def test_training_subclass_name():
+    class Cycling(homework.Training):
+        def get_spent_calories(self):
+            return 1.0
+
+    message = homework.format_training(Cycling(1000, 1, 70))
+    assert message.startswith('Тип тренировки: Cycling;'), (
+        'В сообщении должно быть имя класса тренировки.'
+    )
+
+
+def test_show_training_info_uses_get_spent_calories():
+    class LightRun(homework.Running):
+        def get_spent_calories(self):
+            return 5.0
+
+    info = LightRun(9000, 1, 75).show_training_info()
+    assert info.calories == 5.0, (
+        'Метод `show_training_info` должен брать калории '
+        'из `get_spent_calories`.'
+    )
+
+
+def test_format_training_uses_public_methods():
+    class FastRun(homework.Running):
+        def get_mean_speed(self):
+            return 100.0
+
+    training = FastRun(9000, 1, 75)
+    assert (homework.format_training(training)
+            == training.show_training_info().get_message())
+    training = homework.Running(9000, 1, 75)
+    training.get_spent_calories = lambda: 5
+    assert homework.format_training(training).endswith(
+        'Потрачено ккал: 5.000.'
+    ), (
+        'Функция `format_training` должна учитывать переопределённые '
+        'методы тренировки.'
+    )
+
+
+def test_get_mean_speed_override():
+    class FastRun(homework.Running):
+        def get_mean_speed(self):
+            return 100.0
+
+    training = FastRun(9000, 1, 75)
+    info = training.show_training_info()
+    assert info.speed == 100.0
+    assert info.calories == training.get_spent_calories(), (
+        'Сообщение должно строиться через `get_mean_speed`.'
+    )
+
+
+def test_zero_duration_fails_on_use():
+    training = homework.read_package('RUN', [9000, 0, 75])
+    with pytest.raises(ZeroDivisionError):
+        training.get_mean_speed()
+
+
+KERNEL_ARGS = {
+    'run_cals': (9.75, 75.0, 1.0),
+    'walk_cals': (5.85, 75.0, 1.0, 180.0),
+    'swim_cals': (1.0, 80.0, 1.0),
+}
+
+
+def _read_only_arrays(args, dtype):
+    arrays = [np.full(3, arg, dtype=dtype) for arg in args]
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+@pytest.mark.parametrize('module_name', ['calories', 'calorie_kernels'])
+@pytest.mark.parametrize('name, args', KERNEL_ARGS.items())
+def test_compiled_kernels(module_name, name, args):
+    module = pytest.importorskip(module_name)
+    expected = getattr(kernels, name)(*args)
+    assert getattr(module, name)(*args) == pytest.approx(expected), (
+        f'`{module_name}.{name}` должна считать так же, как `kernels.py`.'
+    )
+    for suffix, dtype in (('_array', np.float64), ('_array32', np.float32)):
+        result = getattr(module, name + suffix)(
+            *_read_only_arrays(args, dtype)
+        )
+        assert result == pytest.approx([expected] * 3, rel=1e-6), (
+            f'`{module_name}.{name}{suffix}` должна считать так же, '
+            'как `kernels.py`, и принимать массивы только для чтения.'
+        )
+
+
+@pytest.mark.parametrize('module_name',
+                         ['kernels', 'calories', 'calorie_kernels'])
+def test_walk_cals_zero_height(module_name):
+    module = pytest.importorskip(module_name)
+    with pytest.raises(ZeroDivisionError):
+        module.walk_cals(5.85, 75.0, 1.0, 0.0)
+
+
+@pytest.mark.parametrize('name, args', KERNEL_ARGS.items())
+def test_cython_kernels_check_sizes(name, args):
+    calories = pytest.importorskip('calories')
+    speed, *other = (np.full(3, arg) for arg in args)
+    with pytest.raises(ValueError):
+        getattr(calories, name + '_array')(
+            speed, *(array[:1] for array in other)
+        )
+
+
+@pytest.mark.parametrize('name, args', KERNEL_ARGS.items())
+def test_jit_kernels(name, args):
+    pytest.importorskip('numba')
+    python_func = getattr(kernels, name).py_func
+    expected = python_func(*args)
+    assert getattr(kernels, name)(*args) == pytest.approx(expected), (
+        f'Скомпилированная `kernels.{name}` должна совпадать с формулой.'
+    )
+    result = getattr(kernels, name + '_array')(
+        *_read_only_arrays(args, np.float64)
+    )
+    assert result == pytest.approx([expected] * 3), (
+        f'`kernels.{name}_array` должна совпадать с формулой.'
+    )